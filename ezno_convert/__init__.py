@@ -1 +1,3 @@
 from .convert import convert_one, BatchConverter, WORDConverter, PPTConverter, XLConverter, WORD, PPT, XL
+from .shard import ShardedConverter
+from .report import ConversionResult, Summary, JSONLReport, CSVReport
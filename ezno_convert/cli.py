@@ -1,11 +1,14 @@
+import multiprocessing
 import sys
 from argparse import ArgumentParser, Namespace
 from pathlib import Path
 from typing import Optional, Sequence, Text
 
 from ezno_convert.common import VERSION, DATE_FORMAT
-from ezno_convert.convert import WORDConverter, PPTConverter, XLConverter
-from ezno_convert.enums import WORD, PPT, XL
+from ezno_convert.convert import BatchConverter
+from ezno_convert.enums import WORD, PPT, XL, ppt_image_types
+from ezno_convert.report import Summary, open_report
+from ezno_convert.shard import ShardedConverter
 
 
 class CommandLineInterface(ArgumentParser):
@@ -33,6 +36,10 @@ class CommandLineInterface(ArgumentParser):
         ''')
         # self.add_argument('-s', '--simulate', action='store_true',
         #                   help='List files and simulate conversions without actually converting anything')
+        self.add_argument('-R', '--report', type=Path, metavar='PATH', help='''
+        Write the outcome of every conversion (source, output, status, error, duration) to this file as it happens.
+        Uses CSV format if PATH ends with .csv, otherwise JSON lines
+        ''')
         self.add_argument('-l', '--list_types', action='store_true', help='Print available conversion types and exit')
         self.add_argument('-v', '--version', action='version', version=f'%(prog)s {VERSION}')
 
@@ -63,6 +70,41 @@ class CommandLineInterface(ArgumentParser):
         Specify names or indexes of specific sheets to convert, instead of converting the entire file. Implies --split
         ''')
 
+        images = self.add_argument_group(
+            title='PowerPoint image options',
+            description=f'Post-process the slide images of PowerPoint image exports '
+                        f'({", ".join(t.name for t in ppt_image_types)}) in the background. Requires Pillow'
+        )
+        images.add_argument('--widths', nargs='+', type=int, metavar='WIDTH', help='''
+        Save resized copies of every slide with these widths (in pixels), each in a "<WIDTH>px" sub-folder
+        ''')
+        images.add_argument('--quality', type=int, help='Recompress slide images with this quality (1-100)')
+        images.add_argument('--image_format', metavar='FORMAT', help='''
+        Image format for post-processed images, for example JPEG or PNG (Default: same as exported)
+        ''')
+        images.add_argument('--contact_sheet', type=int, default=0, metavar='COLUMNS', help='''
+        Create a contact sheet of all slides with this many columns
+        ''')
+        images.add_argument('--images_output', type=Path, metavar='PATH', help='''
+        Folder to save post-processed images to, exported folders are removed once post-processed.
+        Default: next to each exported folder, in a "-processed" folder of the same name
+        ''')
+
+        shard = self.add_argument_group(
+            title='Sharding Options',
+            description='Split a batch between several processes or computers that use the same manifest folder'
+        )
+        shard.add_argument('-m', '--manifest', type=Path, metavar='PATH', help='''
+        Shared folder used to coordinate conversions. Every process started with the same manifest and input paths
+        converts a different part of the files, a merged report.json is written to the manifest when all are done
+        ''')
+        shard.add_argument('--chunk_size', type=int, default=10, metavar='N', help='''
+        Number of files each process claims at a time (Default: %(default)s)
+        ''')
+        shard.add_argument('--lease', type=float, default=600, metavar='SECONDS', help='''
+        Seconds without progress after which a claim is considered abandoned and taken over (Default: %(default)s)
+        ''')
+
     def parse_args(self, args: Optional[Sequence[Text]] = None) -> Namespace:
         args = super().parse_args(args)
         dirs = [p for p in args.PATH if p.is_dir()]
@@ -84,6 +126,37 @@ class CommandLineInterface(ArgumentParser):
         if not valid_output:
             self.error(f'Output path invalid ({args.output})')
 
+        args.post_process = any((args.widths, args.quality, args.image_format, args.contact_sheet, args.images_output))
+        if args.post_process and getattr(PPT, args.converter, None) not in ppt_image_types:
+            self.error(f'PowerPoint image options only apply to image conversion types, not {args.converter}')
+        if args.images_output and not args.images_output.is_dir():
+            self.error(f'Images output path must be a folder ({args.images_output})')
+        if args.quality is not None and not 1 <= args.quality <= 100:
+            self.error(f'Quality must be between 1 and 100 ({args.quality})')
+        if args.post_process:
+            try:
+                from ezno_convert.images import ImagePostProcessor, QUALITY_FORMATS, normalize_format
+            except ImportError:
+                self.error('PowerPoint image options require Pillow (pip install -U ezno-convert[images])')
+            image_format = normalize_format(args.image_format or args.converter)
+            if args.quality is not None and image_format not in QUALITY_FORMATS:
+                self.error(f'{image_format} images ignore --quality, add --image_format with one of {QUALITY_FORMATS}')
+            try:
+                args.post_process = ImagePostProcessor(
+                    widths=args.widths or (), quality=args.quality, format=args.image_format,
+                    contact_sheet=args.contact_sheet, dst=args.images_output, remove_source=bool(args.images_output)
+                )
+            except ValueError as e:
+                self.error(str(e))
+
+        if args.report and not args.report.parent.is_dir():
+            self.error(f'Report path invalid ({args.report})')
+
+        if args.chunk_size < 1:
+            self.error(f'Chunk size must be a positive number ({args.chunk_size})')
+        if args.lease <= 0:
+            self.error(f'Lease must be a positive number of seconds ({args.lease})')
+
         if not any((args.word, args.powerpoint, args.excel)):
             args.all = True
 
@@ -107,19 +180,36 @@ class CommandLineInterface(ArgumentParser):
     def run_converters(self, args: Optional[Sequence[Text]] = None):
         opt = self.parse_args(args)
         kwargs = dict(dst=opt.output, recursive=opt.recursive, date_fmt=opt.dateformat)
-
-        if opt.word:
-            word_gen = WORDConverter(src=opt.word, target=getattr(WORD, opt.converter, None), **kwargs)
-            word_gen.execute_all(True)
-        if opt.powerpoint:
-            pp_gen = PPTConverter(src=opt.powerpoint, target=getattr(PPT, opt.converter, None), **kwargs)
-            pp_gen.execute_all(True)
-        if opt.excel:
-            xl_gen = XLConverter(src=opt.excel, target=getattr(XL, opt.converter, None), sheets=opt.sheet, **kwargs)
-            xl_gen.execute_all(True)
+        converter_class = BatchConverter
+        if opt.manifest:
+            converter_class = ShardedConverter
+            kwargs.update(manifest=opt.manifest, chunk_size=opt.chunk_size, lease_seconds=opt.lease)
+
+        sink = open_report(opt.report) if opt.report else None
+        summary = Summary()
+        try:
+            if opt.word:
+                word_gen = converter_class(app=WORD, src=opt.word, target=getattr(WORD, opt.converter, None), **kwargs)
+                summary.update(word_gen.execute_all(True, sink))
+            if opt.powerpoint:
+                pp_target = getattr(PPT, opt.converter, None)
+                pp_post = opt.post_process or None
+                pp_gen = converter_class(app=PPT, src=opt.powerpoint, target=pp_target, post_process=pp_post, **kwargs)
+                summary.update(pp_gen.execute_all(True, sink))
+            if opt.excel:
+                xl_target = getattr(XL, opt.converter, None)
+                xl_gen = converter_class(app=XL, src=opt.excel, target=xl_target, sheets=opt.sheet, **kwargs)
+                summary.update(xl_gen.execute_all(True, sink))
+        except RuntimeError as e:  # For example a sharding manifest of a different job
+            self.error(str(e))
+        finally:
+            if sink is not None:
+                sink.close()
+        print(summary)
 
 
 def main():
+    multiprocessing.freeze_support()  # Post-processing workers of the frozen executable
     CommandLineInterface().run_converters()
 
 
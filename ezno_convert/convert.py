@@ -1,15 +1,22 @@
 import enum
 import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from dataclasses import dataclass
 from os import PathLike
 from pathlib import Path
-from typing import Collection, Union, Optional
+from typing import Callable, Collection, Iterator, Union, Optional
 
-from comtypes import COMError
-from comtypes.client import CreateObject
+try:
+    from comtypes.client import CreateObject
+except ImportError:  # comtypes only works on Windows, elsewhere only a fake app_factory can be used
+    def CreateObject(prog_id: str):
+        raise RuntimeError(f'Opening {prog_id} requires comtypes and Microsoft Office on Windows')
 
 from ezno_convert.common import validate_paths, multi_glob
 from ezno_convert.enums import PPT, WORD, XL, enum_types
+from ezno_convert.report import ConversionResult, Sink, Summary
 
 logger = logging.getLogger('NativeOfficeConverter')
 
@@ -99,9 +106,14 @@ class BatchConverter:
     recursive: bool = False
     date_fmt: Optional[str] = None
     sheets: Union[Collection, bool] = False
+    # Must be picklable and return the files it created, see images.ImagePostProcessor
+    post_process: Optional[Callable[[Path], Collection[PathLike]]] = None
+    post_process_workers: Optional[int] = None
+    app_factory: Optional[Callable[[str], object]] = None  # Opens the app by its ProgID, see fake.FakeApp
 
     def __post_init__(self):
         self.app_object = None
+        self.pool = None
 
         if isinstance(self.src, (str, PathLike)):
             self.src = [self.src]
@@ -129,27 +141,111 @@ class BatchConverter:
     def __len__(self):
         return len(self.files)
 
-    def __iter__(self):
-        if self.files:
-            self.app_object = CreateObject(self.app.app.value)
-            for i, f in enumerate(self.files):
-                try:
-                    result = convert_one(f, self.dst, self.app_object, self.target, self.date_fmt, self.sheets)
-                except (COMError, FileNotFoundError, NotADirectoryError, ValueError):
-                    logger.exception(f'Failed to convert: {f}')
-                    yield None
-                else:
-                    yield result
-            self.app_object.Quit()
-
-    def execute_all(self, output: bool = False) -> list[Optional[Path]]:
+    def create_app(self):
+        """ Open the Office application used for all conversions of this batch """
+        return (self.app_factory or CreateObject)(self.app.app.value)
+
+    def convert(self, f: Path) -> ConversionResult:
+        """ Convert a single file of this batch with the open app, failures are logged and returned as a result """
+        start = time.perf_counter()
+        try:
+            output = convert_one(f, self.dst, self.app_object, self.target, self.date_fmt, self.sheets)
+        except Exception as e:  # Any failure is recorded and the batch moves on, KeyboardInterrupt still stops it
+            logger.exception(f'Failed to convert: {f}')
+            return ConversionResult(f, error=type(e).__name__, duration=time.perf_counter() - start)
+        return ConversionResult(f, output, duration=time.perf_counter() - start)
+
+    def submit_post_process(self, output: Path) -> Future:
+        """ Run post_process on the output in a worker process, so the app can move on to the next file """
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(self.post_process_workers)
+        return self.pool.submit(self.post_process, output)
+
+    def complete_post_process(self, result: ConversionResult, future: Future) -> ConversionResult:
+        """ Wait for the post-processing of a result, its output becomes the folder of the post-processed files """
+        try:
+            outputs = [os.path.abspath(p) for p in future.result() or ()]
+            # Raises ValueError for outputs on different drives, or if post_process didn't return paths
+            common = Path(os.path.commonpath(outputs)) if outputs else None
+        except Exception as e:
+            logger.error(f'Failed to post-process: {result.output}', exc_info=e)
+            return ConversionResult(result.src, error=f'{type(e).__name__} (post-processing)', duration=result.duration)
+        if common is not None:
+            result.output = common.parent if len(outputs) == 1 else common
+        return result
+
+    @property
+    def max_pending(self) -> int:
+        """ Post-processing jobs allowed in flight before the app waits for one to finish, bounding memory use """
+        return 2 * (self.post_process_workers or os.cpu_count() or 1)
+
+    def wait_post_process(self, futures: Collection[Future], block: bool) -> set[Future]:
+        """ Finished futures, waiting until at least one finishes if `block` is set """
+        done, _ = wait(futures, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        return done
+
+    def post_processed(self, results: Iterator[ConversionResult]) -> Iterator[ConversionResult]:
+        """
+        Pass successful results through post_process (if set), while the app keeps converting the next files.
+        Results are yielded as soon as their post-processing is done, so not necessarily in order.
+        The app only waits when `max_pending` jobs are already in flight
+        """
+        if self.post_process is None:
+            yield from results
+            return
+        pending = {}  # type: dict[Future, ConversionResult]
+        for result in results:
+            if result.output is None:
+                yield result
+                continue
+            pending[self.submit_post_process(result.output)] = result
+            for future in self.wait_post_process(pending, block=len(pending) >= self.max_pending):
+                yield self.complete_post_process(pending.pop(future), future)
+        while pending:
+            for future in self.wait_post_process(pending, block=True):
+                yield self.complete_post_process(pending.pop(future), future)
+
+    def close(self) -> None:
+        """ Quit the app and stop the post-processing workers, dropping jobs that haven't started yet """
+        app_object, self.app_object = self.app_object, None
+        pool, self.pool = self.pool, None
+        try:
+            if app_object is not None:
+                app_object.Quit()
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def results(self) -> Iterator[ConversionResult]:
+        """
+        Convert all files, yielding the full outcome of each conversion as it happens.
+        The app and workers are closed even if iteration stops early (break, cancel or an error in the caller)
+        """
+        if not self.files:
+            return
+        try:
+            self.app_object = self.create_app()
+            yield from self.post_processed(self.convert(f) for f in self.files)
+        finally:
+            self.close()
+
+    def __iter__(self) -> Iterator[Optional[Path]]:
+        return (result.output for result in self.results())
+
+    def execute_all(self, output: bool = False, sink: Optional[Sink] = None) -> Summary:
+        """
+        Convert all files, keeping only running totals in memory.
+        Each result is passed to `sink` (a callable such as JSONLReport / CSVReport) as soon as it's available
+        """
         # TODO - use wrap execution in progressbar
-        all_results = []
-        for result in self:
-            all_results.append(result)
+        summary = Summary()
+        for result in self.results():
+            summary(result)
+            if sink is not None:
+                sink(result)
             if output:
-                print(f'Success: {result}' if result else 'Conversion failed, see logs for details')
-        return all_results
+                print(f'Success: {result.output}' if result.output else f'Failed: {result.src} ({result.error})')
+        return summary
 
 
 @dataclass
@@ -63,3 +63,4 @@ class XL(enum.Enum):
 
 
 enum_types = Union[PPT, WORD, XL]
+ppt_image_types = (PPT.BMP, PPT.GIF, PPT.JPG, PPT.PNG, PPT.TIF)  # Exported as a folder with an image per slide
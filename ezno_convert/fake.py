@@ -0,0 +1,85 @@
+import time
+from pathlib import Path
+
+
+class FakeCOMError(Exception):
+    """ Raised by the fake apps for source files with "fail" in their name """
+
+
+class FakeDocument:
+    """ Stands in for a Word Document, PowerPoint Presentation or Excel Workbook """
+
+    def __init__(self, src: str, delay: float):
+        self.src = src
+        self.delay = delay
+        self.Sheets = FakeSheets(self)
+
+    def SaveAs(self, dst: str, FileFormat: int = 0):
+        time.sleep(self.delay)
+        # Office adds the extension of the format, every save appends a line so tests can spot duplicate conversions
+        with open(f'{dst}.out', 'a', encoding='utf-8') as f:
+            f.write(f'{self.src} {FileFormat}\n')
+
+    def ExportAsFixedFormat(self, fmt: int, dst: str):
+        self.SaveAs(dst, fmt)
+
+    def Close(self):
+        pass
+
+
+class FakeSheet:
+    def __init__(self, doc: FakeDocument, name: str):
+        self.doc = doc
+        self.Name = name
+
+    def ExportAsFixedFormat(self, fmt: int, dst: str):
+        self.doc.SaveAs(dst, fmt)
+
+
+class FakeSheets:
+    names = ('Sheet1', 'Sheet2')
+
+    def __init__(self, doc: FakeDocument):
+        self.doc = doc
+
+    def __iter__(self):
+        return (FakeSheet(self.doc, name) for name in self.names)
+
+    def __call__(self, sheet):
+        return FakeSheet(self.doc, self.names[sheet - 1] if isinstance(sheet, int) else sheet)
+
+
+class FakeDocuments:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def Open(self, src: str) -> FakeDocument:
+        if 'fail' in Path(src).stem:
+            raise FakeCOMError(f'Failed to open {src}')
+        return FakeDocument(src, self.delay)
+
+
+class FakeApp:
+    """
+    Office app backend that works without Office or comtypes, for tests and trying things out on any system.
+    Conversions write a small text file instead of a real document, optionally taking `delay` seconds.
+    Use with BatchConverter(..., app_factory=FakeApp) or functools.partial(FakeApp, delay=...)
+    """
+
+    def __init__(self, prog_id: str, delay: float = 0):
+        self.prog_id = prog_id
+        self.Documents = self.Presentations = self.Workbooks = FakeDocuments(delay)
+
+    def Quit(self):
+        pass
+
+
+def fake_post_process(output: Path, delay: float = 0) -> list[Path]:
+    """ Picklable stand-in for images.ImagePostProcessor, fails for outputs with "broken" in their name """
+    time.sleep(delay)
+    output = Path(output)
+    if 'broken' in output.stem:
+        raise FakeCOMError(f'Failed to post-process {output}')
+    processed = output.with_suffix('.post')
+    processed.write_text(str(output), encoding='utf-8')
+    return [processed]
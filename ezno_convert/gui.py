@@ -7,6 +7,7 @@ import wx
 
 from ezno_convert.common import DATE_FORMAT, VERSION, script_dir
 from ezno_convert.convert import WORD, PPT, XL, BatchConverter, WORDConverter, PPTConverter, XLConverter
+from ezno_convert.report import Summary
 
 PDF = 'PDF'
 logger = logging.getLogger('NativeOfficeConverter')
@@ -35,20 +36,20 @@ class Progress(wx.ProgressDialog):
             style=wx.PD_CAN_ABORT | wx.PD_ELAPSED_TIME | wx.PD_REMAINING_TIME | wx.PD_APP_MODAL | wx.PD_AUTO_HIDE
         )
         self.converters = converters
-        self.results = []  # type: list[tuple[int, Optional[Path]]]
+        self.summary = Summary()
 
-    def run(self) -> list[tuple[int, Optional[Path]]]:
+    def run(self) -> Summary:
         self.Show()
         for con_i, converter in enumerate(self.converters):
             app_name = converter.app.app.value.split('.')[0]
-            for i, result in enumerate(converter):
-                self.results.append((i, result))
-                if isinstance(result, Path):
+            for i, result in enumerate(converter.results()):
+                self.summary(result)
+                if result.output is not None:
                     self.Update(i, f'Running {app_name} converter... ({con_i}/{len(self.converters)})')
                     if self.WasCancelled():
                         self.Destroy()
-                        return self.results
-        return self.results
+                        return self.summary
+        return self.summary
 
 
 class MainFrame(wx.Frame):
@@ -180,10 +181,8 @@ class MainFrame(wx.Frame):
         if converters:
             self.Destroy()
             progress = Progress(converters)
-            results = progress.run()
-            failed = sum(1 for i, p in results if p is None)
-            success = sum(len(c) for c in progress.converters) - failed
-            message = f'Finished converting!\n{failed} item(s) failed\n{success} items converted'
+            summary = progress.run()
+            message = f'Finished converting!\n{summary.failed} item(s) failed\n{summary.succeeded} items converted'
             wx.MessageDialog(progress, message, 'Done').ShowModal()
         else:
             ErrorDialog(self, 'Could not find any files to convert. Check your settings.')
@@ -0,0 +1,128 @@
+import logging
+import math
+import shutil
+from dataclasses import dataclass
+from os import PathLike
+from pathlib import Path
+from typing import Collection, Optional
+
+from PIL import Image
+
+logger = logging.getLogger('NativeOfficeConverter')
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tif', '.tiff')
+FORMAT_EXTENSIONS = {'JPEG': '.jpg', 'TIFF': '.tif'}
+FORMAT_ALIASES = {'JPG': 'JPEG', 'TIF': 'TIFF'}
+QUALITY_FORMATS = ('JPEG', 'WEBP')  # Other formats ignore quality
+PROCESSED_SUFFIX = '-processed'
+
+
+def normalize_format(name: str) -> str:
+    """ Pillow format name of a format or extension name, for example jpg -> JPEG """
+    name = name.upper().lstrip('.')
+    return FORMAT_ALIASES.get(name, name)
+
+
+def slide_number(path: Path) -> tuple[int, str]:
+    """ Sort key so Slide10 comes after Slide9 """
+    digits = ''.join(c for c in path.stem if c.isdigit())
+    return int(digits) if digits else 0, path.stem
+
+
+@dataclass
+class ImagePostProcessor:
+    """
+    Post-process the folder of slide images PowerPoint creates when exporting to an image format.
+    Each slide is read once and all the requested outputs are made from it:
+    resized copies for each of `widths` (in `<width>px` sub folders), a recompressed full size copy (if `quality` or
+    `format` are set), and a contact sheet of all slides with `contact_sheet` columns.
+    Outputs are written to `dst/<folder name>`, or next to the exported folder in `<folder name>-processed` if `dst` is
+    not set, never into the exported folder itself. With `remove_source` the exported folder is deleted once full size
+    copies of all slides were written.
+    Instances are picklable, so they can be passed to BatchConverter(post_process=...) to run in worker processes.
+    """
+    widths: Collection[int] = ()
+    quality: Optional[int] = None
+    format: Optional[str] = None
+    contact_sheet: int = 0
+    contact_width: int = 256
+    dst: Optional[PathLike] = None
+    remove_source: bool = False
+
+    def __post_init__(self):
+        if any(width <= 0 for width in self.widths):
+            raise ValueError(f'Widths must be positive numbers ({", ".join(map(str, self.widths))})')
+        if self.contact_sheet < 0:
+            raise ValueError(f'Contact sheet columns can\'t be negative ({self.contact_sheet})')
+        if self.contact_width <= 0:
+            raise ValueError(f'Contact sheet width must be a positive number ({self.contact_width})')
+        if self.format:
+            self.format = normalize_format(self.format)
+        if self.quality is not None:
+            if not 1 <= self.quality <= 100:
+                raise ValueError(f'Quality must be between 1 and 100 ({self.quality})')
+            if self.format and self.format not in QUALITY_FORMATS:
+                raise ValueError(f'{self.format} images ignore quality, use one of {QUALITY_FORMATS}')
+
+    def save(self, img: Image.Image, path: Path, fmt: str) -> Path:
+        if self.quality is not None and fmt not in QUALITY_FORMATS:
+            raise ValueError(f'{fmt} images ignore quality, set format to one of {QUALITY_FORMATS}')
+        path = path.with_suffix(FORMAT_EXTENSIONS.get(fmt, '.' + fmt.lower()))
+        if fmt == 'JPEG' and img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        options = dict(optimize=True)
+        if self.quality is not None:
+            options['quality'] = self.quality
+        img.save(path, fmt, **options)
+        return path
+
+    @staticmethod
+    def resize(img: Image.Image, width: int) -> Image.Image:
+        if width >= img.width:
+            return img
+        return img.resize((width, max(1, round(img.height * width / img.width))), Image.LANCZOS)
+
+    def __call__(self, folder: PathLike) -> list[Path]:
+        folder = Path(folder)
+        if not folder.is_dir():
+            logger.warning(f'Nothing to post-process, not an image export folder ({folder})')
+            return []
+        slides = sorted((f for f in folder.iterdir() if f.suffix.lower() in IMAGE_EXTENSIONS), key=slide_number)
+        out = Path(self.dst or folder.parent).absolute() / folder.name
+        if out == folder.absolute():
+            out = out.with_name(folder.name + PROCESSED_SUFFIX)
+        copy_slides = self.quality is not None or self.format is not None or self.dst is not None
+        for width in self.widths:
+            (out / f'{width}px').mkdir(parents=True, exist_ok=True)
+        out.mkdir(parents=True, exist_ok=True)
+
+        outputs = []
+        thumbnails = []
+        fmt = self.format
+        for slide in slides:
+            with Image.open(slide) as img:
+                img.load()
+                fmt = self.format or img.format
+                if copy_slides:
+                    outputs.append(self.save(img, out / slide.name, fmt))
+                for width in self.widths:
+                    outputs.append(self.save(self.resize(img, width), out / f'{width}px' / slide.name, fmt))
+                if self.contact_sheet:
+                    thumbnails.append(self.resize(img, self.contact_width).copy())
+
+        if thumbnails:
+            outputs.append(self.save(self.make_contact_sheet(thumbnails), out / 'contact-sheet', fmt))
+        if self.remove_source and copy_slides:
+            shutil.rmtree(folder)
+        return outputs
+
+    def make_contact_sheet(self, thumbnails: list[Image.Image]) -> Image.Image:
+        columns = min(self.contact_sheet, len(thumbnails))
+        rows = math.ceil(len(thumbnails) / columns)
+        cell_w = max(t.width for t in thumbnails)
+        cell_h = max(t.height for t in thumbnails)
+        sheet = Image.new('RGB', (columns * cell_w, rows * cell_h), 'white')
+        for i, thumb in enumerate(thumbnails):
+            row, col = divmod(i, columns)
+            sheet.paste(thumb.convert('RGB'), (col * cell_w, row * cell_h))
+        return sheet
@@ -0,0 +1,121 @@
+import csv
+import json
+from dataclasses import dataclass, field
+from os import PathLike
+from pathlib import Path
+from typing import Callable, Optional
+
+SUCCESS = 'success'
+FAILED = 'failed'
+FIELDS = ('src', 'output', 'status', 'error', 'duration')
+
+
+@dataclass
+class ConversionResult:
+    """ Outcome of converting a single source file """
+    src: Path
+    output: Optional[Path] = None
+    error: Optional[str] = None  # Exception class name, only for failed conversions
+    duration: float = 0
+
+    @property
+    def status(self) -> str:
+        return FAILED if self.output is None else SUCCESS
+
+    def to_dict(self) -> dict:
+        return dict(
+            src=str(self.src),
+            output=str(self.output) if self.output else None,
+            status=self.status,
+            error=self.error,
+            duration=round(self.duration, 3),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ConversionResult':
+        output = data.get('output')
+        return cls(Path(data['src']), Path(output) if output else None, data.get('error'), data.get('duration', 0))
+
+
+Sink = Callable[[ConversionResult], None]
+
+
+@dataclass
+class Summary:
+    """ Running totals of a batch, doubles as a sink so it can be fed results directly """
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    duration: float = 0
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def __call__(self, result: ConversionResult) -> None:
+        self.total += 1
+        self.duration += result.duration
+        if result.output is None:
+            self.failed += 1
+            error = result.error or 'Unknown'
+            self.errors[error] = self.errors.get(error, 0) + 1
+        else:
+            self.succeeded += 1
+
+    def update(self, other: 'Summary') -> None:
+        """ Add the totals of another summary (e.g. of another batch) to this one """
+        self.total += other.total
+        self.succeeded += other.succeeded
+        self.failed += other.failed
+        self.duration += other.duration
+        for error, count in other.errors.items():
+            self.errors[error] = self.errors.get(error, 0) + count
+
+    def __str__(self):
+        errors = ', '.join(f'{name}: {count}' for name, count in self.errors.items())
+        return f'{self.succeeded} item(s) converted, {self.failed} item(s) failed' + (f' ({errors})' if errors else '')
+
+    def to_dict(self) -> dict:
+        return dict(total=self.total, succeeded=self.succeeded, failed=self.failed,
+                    duration=round(self.duration, 3), errors=self.errors)
+
+
+class FileReport:
+    """ Base class for sinks that write every result to a file as soon as it arrives """
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        self.file = self.path.open('w', encoding='utf-8', newline='', buffering=1)
+
+    def __call__(self, result: ConversionResult) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JSONLReport(FileReport):
+    """ Write results as one json object per line """
+
+    def __call__(self, result: ConversionResult) -> None:
+        self.file.write(json.dumps(result.to_dict()) + '\n')
+
+
+class CSVReport(FileReport):
+    """ Write results as csv rows, with a header row """
+
+    def __init__(self, path: PathLike):
+        super().__init__(path)
+        self.writer = csv.DictWriter(self.file, fieldnames=FIELDS)
+        self.writer.writeheader()
+
+    def __call__(self, result: ConversionResult) -> None:
+        self.writer.writerow(result.to_dict())
+
+
+def open_report(path: PathLike) -> FileReport:
+    """ Pick a report format by the file extension, .csv for csv and json lines for anything else """
+    return CSVReport(path) if Path(path).suffix.lower() == '.csv' else JSONLReport(path)
@@ -0,0 +1,284 @@
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import asdict, dataclass, field, is_dataclass
+from os import PathLike
+from pathlib import Path
+from typing import Collection, Iterator, Optional
+
+from ezno_convert.convert import BatchConverter
+from ezno_convert.report import ConversionResult, JSONLReport, Summary
+
+logger = logging.getLogger('NativeOfficeConverter')
+
+FILES_NAME = 'files.json'
+REPORT_NAME = 'report.json'
+RESULTS_NAME = 'results.jsonl'
+
+
+def default_node() -> str:
+    return f'{socket.gethostname()}-{os.getpid()}'
+
+
+def write_atomic(path: Path, data) -> None:
+    """ Write json data to a temporary file and move it in place, so readers never see a partial file """
+    tmp = path.with_name(f'{path.name}.{default_node()}.tmp')
+    tmp.write_text(json.dumps(data, indent=1), encoding='utf-8')
+    os.replace(tmp, path)
+
+
+@dataclass
+class ShardedConverter(BatchConverter):
+    """
+    BatchConverter that splits its files between several processes / hosts sharing the same manifest folder.
+    Files are claimed in chunks through lease files, a lease that isn't renewed for `lease_seconds` is considered
+    abandoned (crashed node) and can be claimed by another node.
+    Iterating yields only the results of this node, see `report()` for the merged results of all nodes.
+    Once all chunks are done, the merged results are written to results.jsonl and their summary to report.json.
+    With post_process, a chunk is only marked done once the post-processing of all its files finished, the app moves
+    on to the next chunk in the meantime
+    """
+    manifest: Optional[PathLike] = None
+    chunk_size: int = 10
+    lease_seconds: float = 600
+    poll_seconds: float = 5
+    node: str = field(default_factory=default_node)
+
+    def __post_init__(self):
+        super().__post_init__()
+        # Chunks leased by this node that aren't done yet, with the results finished so far
+        self.claimed = {}  # type: dict[int, list[ConversionResult]]
+        if self.manifest is None:
+            raise ValueError('A manifest folder is required for sharded conversion')
+        if self.chunk_size < 1:
+            raise ValueError(f'Chunk size must be a positive number ({self.chunk_size})')
+        if self.lease_seconds <= 0:
+            raise ValueError(f'Lease must be a positive number of seconds ({self.lease_seconds})')
+        self.manifest = Path(self.manifest) / self.app.__name__
+        self.leases = self.manifest / 'leases'
+        self.done = self.manifest / 'done'
+        for d in (self.manifest, self.leases, self.done):
+            d.mkdir(parents=True, exist_ok=True)
+        self.roots = [Path(s).absolute() for s in self.src]
+        self.roots = [root if root.is_dir() else root.parent for root in self.roots]
+        entries = sorted(self.relative(f) for f in self.files)
+        self.files = [self.roots[i] / rel for i, rel in entries]
+        self.publish_files(entries)
+
+    def relative(self, f: Path) -> tuple[int, str]:
+        """ Index of the input path a file was found through and its path relative to it, the same on every host """
+        f = f.absolute()
+        for i, root in enumerate(self.roots):
+            if root in f.parents:
+                return i, f.relative_to(root).as_posix()
+        raise ValueError(f'File is not under any of the input paths ({f})')
+
+    def job_key(self, entries: list[tuple[int, str]]) -> str:
+        job = dict(
+            files=entries,
+            target=self.target.name if self.target else None,
+            dst=Path(self.dst).name if self.dst else None,
+            sheets=self.sheets,
+            post_process=self.post_process_key(),
+        )
+        return hashlib.sha1(json.dumps(job, default=str).encode('utf-8')).hexdigest()
+
+    def post_process_key(self) -> Optional[dict]:
+        """ The post_process options as part of the job, only the folder name of an output path like dst """
+        pp = self.post_process
+        if pp is None:
+            return None
+        if is_dataclass(pp):  # For example images.ImagePostProcessor
+            options = asdict(pp)
+            if options.get('dst'):
+                options['dst'] = Path(options['dst']).name
+            return dict(name=type(pp).__qualname__, **options)
+        func = getattr(pp, 'func', pp)  # Unwrap functools.partial
+        return dict(
+            name=f'{func.__module__}.{func.__qualname__}',
+            args=getattr(pp, 'args', ()),
+            keywords=getattr(pp, 'keywords', {}),
+        )
+
+    def publish_files(self, entries: list[tuple[int, str]]) -> None:
+        """
+        The first node to arrive publishes the job (relative file list and its key), every other node must have
+        found exactly the same files with the same options, otherwise the manifest belongs to a different job
+        """
+        path = self.manifest / FILES_NAME
+        key = self.job_key(entries)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            deadline = time.monotonic() + self.lease_seconds
+            while True:
+                try:
+                    published = json.loads(path.read_text(encoding='utf-8'))
+                    break
+                except ValueError:  # Still being written by another node
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f'Manifest file list is corrupt, delete it and restart ({path})')
+                    time.sleep(0.1)
+            if published['key'] != key:
+                raise RuntimeError(
+                    f'Manifest belongs to a different job ({len(published["files"])} files published, '
+                    f'{len(entries)} found here, or different conversion options). '
+                    f'Use a new manifest folder, or delete this one to start over ({self.manifest})'
+                )
+            return
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(dict(key=key, files=entries), f, indent=1)
+
+    @property
+    def chunks(self) -> int:
+        return -(-len(self.files) // self.chunk_size)
+
+    def chunk_files(self, chunk: int) -> list[Path]:
+        return self.files[chunk * self.chunk_size:(chunk + 1) * self.chunk_size]
+
+    def lease_path(self, chunk: int) -> Path:
+        return self.leases / f'{chunk:06d}.lease'
+
+    def done_path(self, chunk: int) -> Path:
+        return self.done / f'{chunk:06d}.json'
+
+    def is_expired(self, lease: Path) -> bool:
+        try:
+            return time.time() - lease.stat().st_mtime > self.lease_seconds
+        except FileNotFoundError:
+            return True
+
+    def claim(self, chunk: int) -> bool:
+        """ Try to take the lease of a chunk, taking over expired leases of crashed nodes """
+        if self.done_path(chunk).exists():
+            return False
+        lease = self.lease_path(chunk)
+        try:
+            fd = os.open(lease, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not self.is_expired(lease):
+                return False
+            # Renaming is atomic, so only one node can take over an expired lease
+            stale = lease.with_name(f'{lease.name}.{self.node}.stale')
+            try:
+                os.rename(lease, stale)
+            except OSError:
+                return False
+            if not self.is_expired(stale):
+                # Another node took over and renewed it between our check and the rename, give it back
+                os.rename(stale, lease)
+                return False
+            logger.warning(f'Taking over expired lease of chunk {chunk} ({stale.read_text(encoding="utf-8")})')
+            stale.unlink()
+            return self.claim(chunk)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(self.node)
+        if self.done_path(chunk).exists():  # Finished by another node right before we claimed it
+            lease.unlink()
+            return False
+        return True
+
+    def owner(self, chunk: int) -> Optional[str]:
+        try:
+            return self.lease_path(chunk).read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return None
+
+    def renew(self, chunk: int) -> None:
+        owner = self.owner(chunk)
+        if owner == self.node:
+            os.utime(self.lease_path(chunk))
+        else:
+            logger.warning(f'Lost lease of chunk {chunk} to {owner}, its files may be converted more than once')
+
+    def release(self, chunk: int, results: list[ConversionResult]) -> None:
+        data = dict(node=self.node, results=[result.to_dict() for result in results])
+        write_atomic(self.done_path(chunk), data)
+        self.give_up(chunk)
+
+    def give_up(self, chunk: int) -> None:
+        """ Remove the lease of a chunk, leaving the lease of a node that took over this chunk alone """
+        if self.owner(chunk) == self.node:
+            self.lease_path(chunk).unlink()
+
+    def pending(self) -> list[int]:
+        return [c for c in range(self.chunks) if not self.done_path(c).exists()]
+
+    def renew_claimed(self) -> None:
+        for chunk in list(self.claimed):
+            self.renew(chunk)
+
+    def convert_claimed(self) -> Iterator[ConversionResult]:
+        """ Claim and convert chunks until a pass over the pending chunks claims none """
+        while True:
+            claimed = False
+            for chunk in self.pending():
+                if chunk in self.claimed or not self.claim(chunk):
+                    continue
+                claimed = True
+                self.claimed[chunk] = []
+                if self.app_object is None:
+                    self.app_object = self.create_app()
+                for f in self.chunk_files(chunk):
+                    result = self.convert(f)
+                    self.renew_claimed()
+                    yield result
+            if not claimed:
+                return
+
+    def wait_post_process(self, futures: Collection[Future], block: bool) -> set[Future]:
+        done = super().wait_post_process(futures, block=False)
+        while block and not done:
+            # Keep the leases of the claimed chunks alive while waiting for post-processing jobs
+            done, _ = wait(futures, timeout=self.lease_seconds / 4, return_when=FIRST_COMPLETED)
+            self.renew_claimed()
+        return done
+
+    def results(self) -> Iterator[ConversionResult]:
+        chunk_of = {f: i // self.chunk_size for i, f in enumerate(self.files)}
+        try:
+            while True:
+                for result in self.post_processed(self.convert_claimed()):
+                    chunk = chunk_of[result.src]
+                    self.claimed[chunk].append(result)
+                    if len(self.claimed[chunk]) == len(self.chunk_files(chunk)):
+                        self.release(chunk, self.claimed.pop(chunk))
+                    yield result
+                if not self.pending():
+                    break
+                # Remaining chunks are leased by other nodes, wait for them to finish or for their leases to expire
+                # without keeping the app open in the meantime
+                self.close()
+                time.sleep(self.poll_seconds)
+        finally:
+            # Stopped early, give the unfinished chunks back to the other nodes right away
+            for chunk in self.claimed:
+                self.give_up(chunk)
+            self.claimed.clear()
+            self.close()
+        self.write_report()
+
+    def report(self) -> Iterator[ConversionResult]:
+        """ Merged results of all the chunks finished so far by all nodes, read one chunk at a time """
+        for chunk in range(self.chunks):
+            try:
+                data = json.loads(self.done_path(chunk).read_text(encoding='utf-8'))
+            except FileNotFoundError:
+                continue
+            yield from (ConversionResult.from_dict(result) for result in data['results'])
+
+    def write_report(self) -> Summary:
+        summary = Summary()
+        results_path = self.manifest / RESULTS_NAME
+        tmp = results_path.with_name(f'{results_path.name}.{self.node}.tmp')
+        with JSONLReport(tmp) as sink:
+            for result in self.report():
+                summary(result)
+                sink(result)
+        os.replace(tmp, results_path)
+        write_atomic(self.manifest / REPORT_NAME, summary.to_dict())
+        return summary
@@ -0,0 +1,42 @@
+import pytest
+
+from ezno_convert.cli import CommandLineInterface
+
+
+def make_deck(tmp_path):
+    deck = tmp_path / 'deck.pptx'
+    deck.touch()
+    return str(deck)
+
+
+@pytest.mark.parametrize('options, message', [
+    (['-c', 'PDF', '--widths', '320'], 'only apply to image conversion types'),
+    (['-c', 'PNG', '--images_output', 'missing'], 'must be a folder'),
+    (['-c', 'PNG', '--quality', '0'], 'between 1 and 100'),
+])
+def test_invalid_image_options_are_rejected(tmp_path, capsys, options, message):
+    options = [str(tmp_path / o) if o == 'missing' else o for o in options]
+    with pytest.raises(SystemExit):
+        CommandLineInterface().parse_args([make_deck(tmp_path), *options])
+    assert message in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('options, message', [
+    (['-c', 'PNG', '--quality', '80'], 'ignore --quality'),
+    (['-c', 'PNG', '--widths', '320', '0'], 'Widths must be positive'),
+])
+def test_invalid_image_settings_are_rejected(tmp_path, capsys, options, message):
+    pytest.importorskip('PIL.Image')
+    with pytest.raises(SystemExit):
+        CommandLineInterface().parse_args([make_deck(tmp_path), *options])
+    assert message in capsys.readouterr().err
+
+
+def test_image_options_create_a_post_processor(tmp_path):
+    pytest.importorskip('PIL.Image')
+    from ezno_convert.images import ImagePostProcessor
+
+    args = CommandLineInterface().parse_args([make_deck(tmp_path), '-c', 'PNG', '--image_format', 'jpg',
+                                              '--quality', '80', '--images_output', str(tmp_path)])
+
+    assert args.post_process == ImagePostProcessor(quality=80, format='JPEG', dst=tmp_path, remove_source=True)
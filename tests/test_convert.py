@@ -0,0 +1,105 @@
+from concurrent.futures import Future
+from functools import partial
+from pathlib import Path
+
+from ezno_convert import BatchConverter, WORD
+from ezno_convert.fake import FakeApp, fake_post_process
+from ezno_convert.report import ConversionResult
+
+
+def make_sources(folder: Path, *names: str) -> Path:
+    folder.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        (folder / name).touch()
+    return folder
+
+
+class CountingConverter(BatchConverter):
+    """ Keeps track of how many post-processing jobs were in flight at once """
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.in_flight = self.most_in_flight = 0
+
+    def submit_post_process(self, output: Path) -> Future:
+        self.in_flight += 1
+        self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        return super().submit_post_process(output)
+
+    def complete_post_process(self, result: ConversionResult, future: Future) -> ConversionResult:
+        self.in_flight -= 1
+        return super().complete_post_process(result, future)
+
+
+def test_post_processing_jobs_in_flight_are_bounded(tmp_path):
+    src = make_sources(tmp_path / 'src', *(f'doc-{i:03d}.docx' for i in range(12)))
+    dst = tmp_path / 'out'
+    dst.mkdir()
+    converter = CountingConverter(src, dst, app=WORD, app_factory=FakeApp, post_process_workers=1,
+                                  post_process=partial(fake_post_process, delay=0.02))
+
+    summary = converter.execute_all()
+
+    assert summary.succeeded == 12
+    assert converter.most_in_flight == converter.max_pending == 2
+
+
+def test_stopping_early_closes_app_and_workers(tmp_path):
+    src = make_sources(tmp_path / 'src', *(f'doc-{i:03d}.docx' for i in range(5)))
+    dst = tmp_path / 'out'
+    dst.mkdir()
+    converter = BatchConverter(src, dst, app=WORD, app_factory=FakeApp, post_process=fake_post_process)
+
+    results = converter.results()
+    next(results)
+    assert converter.app_object is not None and converter.pool is not None
+    results.close()
+
+    assert converter.app_object is None
+    assert converter.pool is None
+
+
+def finished(outputs) -> Future:
+    future = Future()
+    future.set_result(outputs)
+    return future
+
+
+def test_unusable_post_processing_outputs_become_failed_results(tmp_path):
+    converter = BatchConverter(tmp_path, app=WORD)
+    src, output = tmp_path / 'doc.docx', tmp_path / 'doc.pdf'
+
+    kept = converter.complete_post_process(ConversionResult(src, output), finished(None))
+    failed = converter.complete_post_process(ConversionResult(src, output), finished([1, 2]))
+
+    assert kept.output == output
+    assert failed.output is None
+    assert failed.src == src
+    assert failed.error == 'TypeError (post-processing)'
+
+
+def slow_post_process(output: Path) -> list[Path]:
+    """ Post-processing that takes longer for outputs with "slow" in their name """
+    return fake_post_process(output, delay=0.5 if 'slow' in Path(output).stem else 0)
+
+
+def test_post_processed_results_are_yielded_as_they_finish(tmp_path):
+    src = make_sources(tmp_path / 'src', 'a-slow.docx', 'b.docx', 'broken.docx', 'fail.docx')
+    dst = tmp_path / 'out'
+    dst.mkdir()
+    converter = BatchConverter(src, dst, app=WORD, app_factory=FakeApp, post_process=slow_post_process,
+                               post_process_workers=2)
+    converter.files = sorted(converter.files)
+
+    results = list(converter.results())
+
+    assert [result.src.name for result in results][-1] == 'a-slow.docx'
+    outcomes = {result.src.name: (result.output, result.error) for result in results}
+    assert outcomes == {
+        'a-slow.docx': (dst.absolute(), None),
+        'b.docx': (dst.absolute(), None),
+        'broken.docx': (None, 'FakeCOMError (post-processing)'),
+        'fail.docx': (None, 'FakeCOMError'),
+    }
+    assert converter.pool is None
+    assert converter.app_object is None
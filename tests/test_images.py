@@ -0,0 +1,51 @@
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+from ezno_convert.images import ImagePostProcessor  # noqa: E402
+
+
+def make_export(folder, slides=3):
+    folder.mkdir()
+    for i in range(1, slides + 1):
+        Image.new('RGB', (640, 360), (i * 40, 0, 0)).save(folder / f'Slide{i}.PNG')
+    return folder
+
+
+def test_outputs_never_go_into_the_export(tmp_path):
+    export = make_export(tmp_path / 'deck')
+    processor = ImagePostProcessor(widths=(160,), contact_sheet=2)
+
+    first = processor(export)
+    second = processor(export)
+
+    assert first == second
+    assert sorted(f.name for f in export.iterdir()) == ['Slide1.PNG', 'Slide2.PNG', 'Slide3.PNG']
+    assert {f.parent for f in first} == {tmp_path / 'deck-processed', tmp_path / 'deck-processed' / '160px'}
+    with Image.open(tmp_path / 'deck-processed' / 'contact-sheet.png') as sheet:
+        assert sheet.size == (512, 288)  # 2 columns x 2 rows of 256px wide thumbnails
+
+
+def test_remove_source_after_moving_to_dst(tmp_path):
+    export = make_export(tmp_path / 'deck')
+    dst = tmp_path / 'final'
+    dst.mkdir()
+
+    outputs = ImagePostProcessor(format='jpg', quality=70, dst=dst, remove_source=True)(export)
+
+    assert sorted(f.name for f in outputs) == ['Slide1.jpg', 'Slide2.jpg', 'Slide3.jpg']
+    assert not export.exists()
+
+
+@pytest.mark.parametrize('options', [
+    dict(quality=0), dict(quality=101), dict(quality=80, format='PNG'),
+    dict(widths=(160, 0)), dict(widths=(-160,)), dict(contact_sheet=-1), dict(contact_sheet=2, contact_width=0),
+])
+def test_invalid_options_are_rejected(options):
+    with pytest.raises(ValueError):
+        ImagePostProcessor(**options)
+
+
+def test_quality_of_exported_format_that_ignores_it_fails(tmp_path):
+    with pytest.raises(ValueError, match='ignore quality'):
+        ImagePostProcessor(quality=80)(make_export(tmp_path / 'deck'))
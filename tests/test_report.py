@@ -0,0 +1,72 @@
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from ezno_convert import BatchConverter, CSVReport, JSONLReport, Summary, WORD
+from ezno_convert.fake import FakeApp
+from ezno_convert.report import FIELDS, ConversionResult, open_report
+
+
+def make_converter(tmp_path: Path) -> BatchConverter:
+    src = tmp_path / 'src'
+    src.mkdir()
+    for name in ('doc-1.docx', 'doc-2.docx', 'fail-1.docx'):
+        (src / name).touch()
+    dst = tmp_path / 'out'
+    dst.mkdir()
+    return BatchConverter(src, dst, app=WORD, app_factory=FakeApp)
+
+
+@pytest.mark.parametrize('name', ['report.jsonl', 'report.csv'])
+def test_report_has_a_row_per_file(tmp_path, name):
+    converter = make_converter(tmp_path)
+    path = tmp_path / name
+    with open_report(path) as sink:
+        summary = converter.execute_all(sink=sink)
+
+    with path.open(encoding='utf-8', newline='') as f:
+        if name.endswith('.csv'):
+            assert isinstance(sink, CSVReport)
+            reader = csv.DictReader(f)
+            assert tuple(reader.fieldnames) == FIELDS
+            rows = list(reader)
+        else:
+            assert isinstance(sink, JSONLReport)
+            rows = [json.loads(line) for line in f]
+            assert all(tuple(row) == FIELDS for row in rows)
+
+    rows = {Path(row['src']).name: row for row in rows}
+    assert sorted(rows) == ['doc-1.docx', 'doc-2.docx', 'fail-1.docx']
+    failed = rows['fail-1.docx']
+    assert failed['src'] == str(converter.src[0] / 'fail-1.docx')
+    assert failed['status'] == 'failed'
+    assert failed['error'] == 'FakeCOMError'
+    assert not failed['output']
+    assert all(rows[name]['status'] == 'success' and rows[name]['output'] for name in ('doc-1.docx', 'doc-2.docx'))
+    assert (summary.total, summary.succeeded, summary.failed) == (3, 2, 1)
+    assert summary.errors == {'FakeCOMError': 1}
+
+
+def test_sink_is_called_once_per_file(tmp_path):
+    converter = make_converter(tmp_path)
+    results = []
+
+    converter.execute_all(sink=results.append)
+
+    assert sorted(result.src.name for result in results) == ['doc-1.docx', 'doc-2.docx', 'fail-1.docx']
+    assert all(isinstance(result, ConversionResult) for result in results)
+
+
+def test_summary_update_adds_totals():
+    first, second = Summary(), Summary()
+    first(ConversionResult(Path('a.docx'), Path('a.pdf'), duration=1))
+    first(ConversionResult(Path('b.docx'), error='FakeCOMError', duration=2))
+    second(ConversionResult(Path('c.docx'), error='FakeCOMError', duration=3))
+    second(ConversionResult(Path('d.docx')))
+
+    first.update(second)
+
+    assert first.to_dict() == dict(total=4, succeeded=1, failed=3, duration=6, errors={'FakeCOMError': 2, 'Unknown': 1})
+    assert str(first) == '1 item(s) converted, 3 item(s) failed (FakeCOMError: 2, Unknown: 1)'
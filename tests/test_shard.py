@@ -0,0 +1,188 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from ezno_convert import ShardedConverter, WORD
+from ezno_convert.fake import FakeApp, fake_post_process
+
+ROOT = Path(__file__).parent.parent
+
+NODE_SCRIPT = '''
+import sys
+from functools import partial
+from ezno_convert import ShardedConverter, WORD
+from ezno_convert.fake import FakeApp
+
+src, dst, manifest = sys.argv[1:]
+converter = ShardedConverter(app=WORD, src=src, dst=dst, manifest=manifest, chunk_size=3, poll_seconds=0.05,
+                             app_factory=partial(FakeApp, delay=0.01))
+converter.execute_all()
+'''
+
+
+def make_sources(folder: Path, count: int, failing: int = 0) -> Path:
+    folder.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        (folder / f'doc-{i:03d}.docx').touch()
+    for i in range(failing):
+        (folder / f'fail-{i:03d}.docx').touch()
+    return folder
+
+
+def make_converter(src: Path, dst: Path, manifest: Path, **kwargs) -> ShardedConverter:
+    dst.mkdir(exist_ok=True)
+    return ShardedConverter(app=WORD, src=src, dst=dst, manifest=manifest, chunk_size=3, poll_seconds=0.05,
+                            app_factory=FakeApp, **kwargs)
+
+
+def test_nodes_share_work_without_duplicates(tmp_path):
+    src = make_sources(tmp_path / 'src', 20, failing=1)
+    dst = tmp_path / 'out'
+    dst.mkdir()
+    manifest = tmp_path / 'manifest'
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    nodes = [
+        subprocess.Popen([sys.executable, '-c', NODE_SCRIPT, str(src), str(dst), str(manifest)], env=env)
+        for _ in range(4)
+    ]
+    assert all(node.wait(timeout=120) == 0 for node in nodes)
+
+    outputs = sorted(dst.iterdir())
+    assert len(outputs) == 20
+    assert all(len(f.read_text(encoding='utf-8').splitlines()) == 1 for f in outputs)  # Converted exactly once
+
+    job = manifest / 'WORD'
+    report = json.loads((job / 'report.json').read_text(encoding='utf-8'))
+    assert report['total'] == 21
+    assert report['succeeded'] == 20
+    assert report['failed'] == 1
+    assert report['errors'] == {'FakeCOMError': 1}
+    results = [json.loads(line) for line in (job / 'results.jsonl').read_text(encoding='utf-8').splitlines()]
+    assert len({r['src'] for r in results}) == 21
+    assert not list((job / 'leases').iterdir())
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    converter = make_converter(make_sources(tmp_path / 'src', 7), tmp_path / 'out', tmp_path / 'manifest')
+    lease = converter.lease_path(0)
+    lease.write_text('crashed-node', encoding='utf-8')
+    expired = time.time() - converter.lease_seconds - 1
+    os.utime(lease, (expired, expired))
+
+    summary = converter.execute_all()
+
+    assert summary.total == 7
+    done = json.loads(converter.done_path(0).read_text(encoding='utf-8'))
+    assert done['node'] == converter.node
+    assert not list(converter.leases.iterdir())
+
+
+def test_live_lease_is_not_taken_over(tmp_path):
+    converter = make_converter(make_sources(tmp_path / 'src', 7), tmp_path / 'out', tmp_path / 'manifest')
+    converter.lease_path(0).write_text('other-node', encoding='utf-8')
+    assert not converter.claim(0)
+    assert converter.claim(1)
+
+
+def test_manifest_of_another_job_is_rejected(tmp_path):
+    src = make_sources(tmp_path / 'src', 5)
+    make_converter(src, tmp_path / 'out', tmp_path / 'manifest').execute_all()
+    make_sources(src, 10)
+    with pytest.raises(RuntimeError, match='different job'):
+        make_converter(src, tmp_path / 'out', tmp_path / 'manifest')
+
+
+def test_manifest_of_other_post_processing_is_rejected(tmp_path):
+    src = make_sources(tmp_path / 'src', 5)
+    make_converter(src, tmp_path / 'out', tmp_path / 'manifest', post_process=fake_post_process).execute_all()
+    with pytest.raises(RuntimeError, match='different job'):
+        make_converter(src, tmp_path / 'out', tmp_path / 'manifest', post_process=partial(fake_post_process, delay=1))
+    with pytest.raises(RuntimeError, match='different job'):
+        make_converter(src, tmp_path / 'out', tmp_path / 'manifest')
+
+
+def test_files_are_published_relative_to_inputs(tmp_path):
+    src = make_sources(tmp_path / 'src', 5)
+    first = make_converter(src, tmp_path / 'out', tmp_path / 'manifest')
+    # The same share, mounted under a different path on another host
+    mounted = shutil.copytree(src, tmp_path / 'mounted')
+    second = make_converter(mounted, tmp_path / 'out', tmp_path / 'manifest')
+
+    published = json.loads((first.manifest / 'files.json').read_text(encoding='utf-8'))
+    assert [rel for _, rel in published['files']] == [f'doc-{i:03d}.docx' for i in range(5)]
+    assert second.files == [mounted.absolute() / f'doc-{i:03d}.docx' for i in range(5)]
+
+
+def test_chunks_are_done_only_after_post_processing(tmp_path):
+    src = make_sources(tmp_path / 'src', 5)
+    (src / 'broken.docx').touch()
+    dst = tmp_path / 'out'
+    converter = make_converter(src, dst, tmp_path / 'manifest', post_process=partial(fake_post_process, delay=0.05))
+
+    summary = converter.execute_all()
+
+    assert summary.succeeded == 5
+    assert summary.errors == {'FakeCOMError (post-processing)': 1}
+    for chunk in range(converter.chunks):
+        done = json.loads(converter.done_path(chunk).read_text(encoding='utf-8'))
+        for result in done['results']:
+            broken = 'broken' in result['src']
+            assert result['status'] == ('failed' if broken else 'success')
+            assert result['output'] == (None if broken else str(dst.absolute()))
+    assert len(list(dst.glob('*.post'))) == 5
+
+
+def test_stopping_early_gives_up_the_lease(tmp_path):
+    converter = make_converter(make_sources(tmp_path / 'src', 7), tmp_path / 'out', tmp_path / 'manifest')
+
+    results = converter.results()
+    next(results)
+    assert converter.owner(0) == converter.node
+    results.close()
+
+    assert converter.app_object is None
+    assert not list(converter.leases.iterdir())
+    assert converter.pending() == [0, 1, 2]
+
+
+@pytest.mark.parametrize('option', [dict(chunk_size=0), dict(lease_seconds=0), dict(lease_seconds=-5)])
+def test_invalid_options_are_rejected(tmp_path, option):
+    src = make_sources(tmp_path / 'src', 3)
+    with pytest.raises(ValueError):
+        ShardedConverter(app=WORD, src=src, manifest=tmp_path / 'manifest', app_factory=FakeApp, **option)
+
+
+class ReleaseRecordingConverter(ShardedConverter):
+    """ Records how many files were already converted when each chunk was released """
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.converted_at_release = {}
+
+    def release(self, chunk, results):
+        self.converted_at_release[chunk] = len(list(Path(self.dst).glob('*.out')))
+        super().release(chunk, results)
+
+
+def test_next_chunk_is_converted_while_post_processing(tmp_path):
+    src = make_sources(tmp_path / 'src', 6)
+    dst = tmp_path / 'out'
+    dst.mkdir()
+    converter = ReleaseRecordingConverter(app=WORD, src=src, dst=dst, manifest=tmp_path / 'manifest', chunk_size=3,
+                                          app_factory=FakeApp, post_process_workers=2,
+                                          post_process=partial(fake_post_process, delay=0.3))
+
+    summary = converter.execute_all()
+
+    assert summary.succeeded == 6
+    assert converter.converted_at_release[0] > 3  # The app didn't wait for the first chunk's images
+    assert converter.pending() == []
+    assert not converter.claimed
+    assert not list(converter.leases.iterdir())